@@ -6,7 +6,7 @@ This script sets up a standardized Python project with virtual environment,
 GitHub repository, and recommended project structure.
 
 Usage:
-    ./setup_python_project.py <project_name> [--no-github] [--public]
+    ./setup_python_project.py <project_name> [--no-github] [--public] [--upgrade-pip]
 
 Example:
     ./setup_python_project.py my-project
@@ -18,116 +18,295 @@ import os
 import sys
 import subprocess
 import re
-import shutil
+import shlex
+import time
 from pathlib import Path
 
 
-def setup_virtual_environment(project_name):
-    """Create and set up a Python virtual environment."""
+# Runs of whitespace/underscores in a folder name, collapsed to hyphens
+_NAME_RE = re.compile(r'[\s_]+')
+
+# Cached `gh api user` login, reused for GITHUB_USERNAME_TTL seconds
+GITHUB_USERNAME_CACHE = Path.home() / ".cache" / "dsr-devops" / "github-username"
+GITHUB_USERNAME_TTL = 7 * 24 * 60 * 60
+
+# Batches of up to this many files are written sequentially; for them a
+# thread pool costs more than it saves on local disk
+PARALLEL_WRITE_THRESHOLD = 8
+
+# Static file contents, stored pre-encoded
+GITIGNORE_BYTES = b"""\
+# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+env/
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+*.egg-info/
+.installed.cfg
+*.egg
+
+# Virtual Environment
+.venv/
+venv/
+ENV/
+
+# IDE
+.idea/
+.vscode/
+*.swp
+*.swo
+
+# Testing
+.coverage
+htmlcov/
+.pytest_cache/
+"""
+
+REQUIREMENTS_BYTES = b"""\
+# Project dependencies
+"""
+
+REQUIREMENTS_DEV_BYTES = b"""\
+# Development dependencies
+pytest
+black
+flake8
+mypy
+"""
+
+INIT_TEMPLATE = """\
+\"\"\"Main package for {project_name}.\"\"\"
+
+__version__ = '0.1.0'
+"""
+
+MAIN_TEMPLATE = """\
+\"\"\"Main module for {project_name}.\"\"\"
+
+def main():
+    \"\"\"Main entry point.\"\"\"
+    print("Hello, world!")
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+TEST_MAIN_TEMPLATE = """\
+\"\"\"Tests for {project_name}.\"\"\"
+
+from {pkg}.main import main
+
+def test_main():
+    \"\"\"Test the main function.\"\"\"
+    # This is a placeholder test
+    assert True
+"""
+
+SETUP_PY_TEMPLATE = """\
+\"\"\"Package setup.\"\"\"
+
+from setuptools import setup, find_packages
+
+setup(
+    name="{project_name}",
+    version="0.1.0",
+    packages=find_packages(where="src"),
+    package_dir={{"": "src"}},
+    install_requires=[
+        # List your dependencies here
+    ],
+)
+"""
+
+PYPROJECT_BYTES = b"""\
+[build-system]
+requires = ["setuptools>=42", "wheel"]
+build-backend = "setuptools.build_meta"
+
+[tool.black]
+line-length = 88
+target-version = ["py38"]
+"""
+
+README_TEMPLATE = """\
+# {project_name}
+
+## Description
+
+A brief description of the project.
+
+## Installation
+
+```bash
+# Clone the repository
+git clone https://github.com/{github_username}/{project_name}.git
+cd {project_name}
+
+# Create and activate virtual environment
+python -m venv .venv
+source .venv/bin/activate  # On Windows: .venv\\Scripts\\activate
+
+# Install dependencies
+pip install -r requirements.txt
+```
+
+## Usage
+
+```python
+from {pkg}.main import main
+
+main()
+```
+"""
+
+
+def write_file(path, content):
+    """Write content to path with LF line endings, encoding str as UTF-8."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    Path(path).write_bytes(content)
+
+
+def write_files(jobs):
+    """Write (path, content) pairs, concurrently for large batches, and return the paths."""
+    if len(jobs) <= PARALLEL_WRITE_THRESHOLD:
+        for path, content in jobs:
+            write_file(path, content)
+    else:
+        # Imported here: concurrent.futures is slow to import and rarely needed
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # Consume the iterator so any write error is raised here
+            list(executor.map(lambda job: write_file(*job), jobs))
+    return [path for path, _ in jobs]
+
+
+def setup_virtual_environment(project_name, upgrade_pip=False):
+    """Create and set up a Python virtual environment. Returns the files created."""
     print(f"Creating virtual environment for {project_name}...")
     
     # Create venv
     subprocess.run(["python3", "-m", "venv", ".venv"], check=True)
     
     # Create requirements files
-    with open("requirements.txt", "w") as f:
-        f.write("# Project dependencies\n")
-    
-    with open("requirements-dev.txt", "w") as f:
-        f.write("# Development dependencies\n")
-        f.write("pytest\n")
-        f.write("black\n")
-        f.write("flake8\n")
-        f.write("mypy\n")
+    created_files = write_files([
+        ("requirements.txt", REQUIREMENTS_BYTES),
+        ("requirements-dev.txt", REQUIREMENTS_DEV_BYTES),
+    ])
     
-    # Activate and install base requirements
+    # Install dev requirements (and pip itself, if requested) in one pip invocation
     if os.name == 'nt':  # Windows
-        pip_path = ".venv/Scripts/pip"
+        python_path = ".venv/Scripts/python"
     else:  # Unix/Mac
-        pip_path = ".venv/bin/pip"
+        python_path = ".venv/bin/python"
     
-    subprocess.run([pip_path, "install", "--upgrade", "pip"], check=True)
-    subprocess.run([pip_path, "install", "-r", "requirements-dev.txt"], check=True)
+    # Prefer uv's much faster resolver/installer when it is on PATH
+    import shutil  # Only needed here; keeps it off the startup import path
+    if shutil.which("uv"):
+        pip_command = ["uv", "pip", "install", "--python", python_path]
+    else:
+        pip_command = [python_path, "-m", "pip", "install", "--no-input", "--disable-pip-version-check"]
+    if upgrade_pip:
+        pip_command += ["--upgrade", "pip"]
+    subprocess.run(pip_command + ["-r", "requirements-dev.txt"], check=True)
     
     print("Virtual environment created and dependencies installed.")
+    return created_files
 
 
 def create_project_structure(project_name):
-    """Create standardized project directory structure."""
+    """Create standardized project directory structure. Returns the files created."""
     print(f"Creating project structure for {project_name}...")
     
-    # Create directories
-    os.makedirs(f"src/{project_name.replace('-', '_')}", exist_ok=True)
-    os.makedirs("tests", exist_ok=True)
-    os.makedirs("docs", exist_ok=True)
-    
-    # Create __init__.py files
-    package_dir = f"src/{project_name.replace('-', '_')}"
-    with open(f"{package_dir}/__init__.py", "w") as f:
-        f.write(f'"""Main package for {project_name}."""\n\n')
-        f.write("__version__ = '0.1.0'\n")
-    
-    # Create main module file
-    with open(f"{package_dir}/main.py", "w") as f:
-        f.write(f'"""Main module for {project_name}."""\n\n')
-        f.write("def main():\n")
-        f.write('    """Main entry point."""\n')
-        f.write('    print("Hello, world!")\n\n\n')
-        f.write('if __name__ == "__main__":\n')
-        f.write('    main()\n')
-    
-    # Create basic test file
-    with open("tests/test_main.py", "w") as f:
-        f.write(f'"""Tests for {project_name}."""\n\n')
-        f.write(f"from {project_name.replace('-', '_')}.main import main\n\n")
-        f.write("def test_main():\n")
-        f.write('    """Test the main function."""\n')
-        f.write('    # This is a placeholder test\n')
-        f.write('    assert True\n')
+    pkg = project_name.replace('-', '_')
+    package_dir = f"src/{pkg}"
     
-    # Create setup.py
-    with open("setup.py", "w") as f:
-        f.write('"""Package setup."""\n\n')
-        f.write('from setuptools import setup, find_packages\n\n')
-        f.write('setup(\n')
-        f.write(f'    name="{project_name}",\n')
-        f.write('    version="0.1.0",\n')
-        f.write('    packages=find_packages(where="src"),\n')
-        f.write('    package_dir={"": "src"},\n')
-        f.write('    install_requires=[\n')
-        f.write('        # List your dependencies here\n')
-        f.write('    ],\n')
-        f.write(')\n')
+    # Create directories
+    for directory in (package_dir, "tests", "docs"):
+        Path(directory).mkdir(parents=True, exist_ok=True)
     
-    # Create pyproject.toml
-    with open("pyproject.toml", "w") as f:
-        f.write('[build-system]\n')
-        f.write('requires = ["setuptools>=42", "wheel"]\n')
-        f.write('build-backend = "setuptools.build_meta"\n\n')
-        f.write('[tool.black]\n')
-        f.write('line-length = 88\n')
-        f.write('target-version = ["py38"]\n')
+    # Write the package, test and packaging files concurrently
+    created_files = write_files([
+        (f"{package_dir}/__init__.py", INIT_TEMPLATE.format(project_name=project_name)),
+        (f"{package_dir}/main.py", MAIN_TEMPLATE.format(project_name=project_name)),
+        ("tests/test_main.py", TEST_MAIN_TEMPLATE.format(
+            project_name=project_name, pkg=pkg
+        )),
+        ("setup.py", SETUP_PY_TEMPLATE.format(project_name=project_name)),
+        ("pyproject.toml", PYPROJECT_BYTES),
+    ])
     
     print("Project structure created.")
+    return created_files
 
 
 def get_github_username():
-    """Get GitHub username from gh CLI if available."""
+    """Get GitHub username from gh CLI if available, cached on disk for a week."""
+    try:
+        if time.time() - GITHUB_USERNAME_CACHE.stat().st_mtime < GITHUB_USERNAME_TTL:
+            username = GITHUB_USERNAME_CACHE.read_text().strip()
+            if username:
+                return username
+    except OSError:
+        pass  # No usable cache; fall through to gh
+    
     try:
         result = subprocess.run(
             ["gh", "api", "user", "--jq", ".login"],
             check=True,
-            capture_output=True,
-            text=True
+            capture_output=True
         )
-        username = result.stdout.strip()
-        return username if username else "yourusername"
-    except subprocess.CalledProcessError:
+        # GitHub logins are ASCII, so skip locale-aware text decoding
+        username = result.stdout.strip().decode('ascii', 'replace')
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return "yourusername"
+    
+    if not username:
         return "yourusername"
+    
+    try:
+        GITHUB_USERNAME_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        GITHUB_USERNAME_CACHE.write_text(username + "\n")
+    except OSError:
+        pass  # Caching is best effort
+    return username
+
+def get_github_remote_url(repo_url):
+    """Turn a repo URL printed by gh into a git remote using gh's git_protocol."""
+    try:
+        result = subprocess.run(
+            ["gh", "config", "get", "git_protocol"],
+            check=True,
+            capture_output=True
+        )
+        protocol = result.stdout.strip().decode('ascii', 'replace')
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        protocol = "https"
+    
+    if protocol == "ssh":
+        host, _, repo_path = repo_url.removeprefix("https://").partition("/")
+        return f"git@{host}:{repo_path}.git"
+    return f"{repo_url}.git"
 
-def setup_git(project_name, use_github=True, visibility="private"):
-    """Initialize git repository and make initial commit. Optionally create GitHub repo."""
+
+def setup_git(project_name, use_github=True, visibility="private", created_files=()):
+    """Initialize git repository and commit the generated files. Optionally create GitHub repo."""
     print("Setting up Git repository...")
+    pkg = project_name.replace('-', '_')
     
     # Get GitHub username if using GitHub
     github_username = get_github_username() if use_github else "yourusername"
@@ -137,117 +316,83 @@ def setup_git(project_name, use_github=True, visibility="private"):
         print(f"Warning: Invalid visibility '{visibility}'. Defaulting to 'private'.")
         visibility = "private"
     
-    # Create .gitignore
-    with open(".gitignore", "w") as f:
-        f.write("# Python\n")
-        f.write("__pycache__/\n")
-        f.write("*.py[cod]\n")
-        f.write("*$py.class\n")
-        f.write("*.so\n")
-        f.write(".Python\n")
-        f.write("env/\n")
-        f.write("build/\n")
-        f.write("develop-eggs/\n")
-        f.write("dist/\n")
-        f.write("downloads/\n")
-        f.write("eggs/\n")
-        f.write(".eggs/\n")
-        f.write("lib/\n")
-        f.write("lib64/\n")
-        f.write("parts/\n")
-        f.write("sdist/\n")
-        f.write("var/\n")
-        f.write("*.egg-info/\n")
-        f.write(".installed.cfg\n")
-        f.write("*.egg\n\n")
-        f.write("# Virtual Environment\n")
-        f.write(".venv/\n")
-        f.write("venv/\n")
-        f.write("ENV/\n\n")
-        f.write("# IDE\n")
-        f.write(".idea/\n")
-        f.write(".vscode/\n")
-        f.write("*.swp\n")
-        f.write("*.swo\n\n")
-        f.write("# Testing\n")
-        f.write(".coverage\n")
-        f.write("htmlcov/\n")
-        f.write(".pytest_cache/\n")
-    
-    # Create README.md
-    with open("README.md", "w") as f:
-        f.write(f"# {project_name}\n\n")
-        f.write("## Description\n\n")
-        f.write("A brief description of the project.\n\n")
-        f.write("## Installation\n\n")
-        f.write("```bash\n")
-        f.write("# Clone the repository\n")
-        f.write(f"git clone https://github.com/{github_username}/{project_name}.git\n")
-        f.write(f"cd {project_name}\n\n")
-        f.write("# Create and activate virtual environment\n")
-        f.write("python -m venv .venv\n")
-        f.write("source .venv/bin/activate  # On Windows: .venv\\Scripts\\activate\n\n")
-        f.write("# Install dependencies\n")
-        f.write("pip install -r requirements.txt\n")
-        f.write("```\n\n")
-        f.write("## Usage\n\n")
-        f.write("```python\n")
-        f.write(f"from {project_name.replace('-', '_')}.main import main\n\n")
-        f.write("main()\n")
-        f.write("```\n")
-    
-    # Initialize git
-    subprocess.run(["git", "init"], check=True)
+    # Create .gitignore and README.md (both must exist before git add)
+    created_files = list(created_files) + write_files([
+        (".gitignore", GITIGNORE_BYTES),
+        ("README.md", README_TEMPLATE.format(
+            project_name=project_name,
+            github_username=github_username,
+            pkg=pkg,
+        )),
+    ])
     
-    # Ensure dsr-scripts is excluded from git
+    # Ensure dsr-scripts is excluded from git. Written before git init, which
+    # leaves existing files under .git/ in place when copying its templates.
     exclude_file = os.path.join(".git", "info", "exclude")
     os.makedirs(os.path.dirname(exclude_file), exist_ok=True)
     with open(exclude_file, "a") as f:
         f.write("dsr-scripts/\n")
     
-    # Add all files (using a more compatible approach)
-    print("Adding files to git...")
-    
-    # First, add .gitignore to make sure it's respected
-    if os.path.exists(".gitignore"):
-        subprocess.run(["git", "add", ".gitignore"], check=True)
-        
-    # Then add all files (let .gitignore handle exclusions)
-    subprocess.run(["git", "add", "."], check=True)
+    # Start creating the remote repository now so the GitHub API round trip
+    # overlaps with the local commit. Without --source, gh does not need the
+    # local repository and prints the new repository's URL instead.
+    gh_process = None
+    if use_github:
+        try:
+            gh_process = subprocess.Popen(
+                ["gh", "repo", "create", project_name, f"--{visibility}"],
+                stdout=subprocess.PIPE
+            )
+            print(f"Creating GitHub repository for {project_name}...")
+        except FileNotFoundError:
+            pass  # Reported below, once the local commit is done
     
-    # Commit the initial structure
-    subprocess.run(["git", "commit", "-m", "Initial commit with project structure"], check=True)
+    # Initialize, add only the generated files (no full-tree scan) and commit.
+    # Force-add since every path is ours, but a package named e.g. "lib" or
+    # "build" would otherwise match a .gitignore pattern and make git add fail.
+    print("Adding files to git...")
+    git_commands = [
+        ["git", "init"],
+        ["git", "add", "-f", "--", *created_files],
+        ["git", "commit", "-m", "Initial commit with project structure"],
+    ]
+    try:
+        if os.name == 'nt':  # Windows: no POSIX shell guaranteed
+            for command in git_commands:
+                subprocess.run(command, check=True)
+        else:  # Unix/Mac: chain the commands in a single shell process
+            subprocess.run(
+                ["sh", "-c", " && ".join(shlex.join(command) for command in git_commands)],
+                check=True
+            )
+    except subprocess.CalledProcessError:
+        # Stop and reap the overlapped gh call; it may already have created the repo
+        if gh_process is not None:
+            gh_process.terminate()
+            gh_process.wait()
+            print(f"Warning: Local commit failed, but GitHub repository '{project_name}' may already exist.")
+            print(f"Check https://github.com/{github_username}/{project_name} and delete it before re-running.")
+        raise
     
-    # Check if GitHub CLI is available and create remote repository if requested
+    # Connect and push to the remote repository if requested
     if use_github:
         try:
-            # Check if gh CLI is installed
-            subprocess.run(["gh", "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if gh_process is None:
+                raise FileNotFoundError("gh")
             
-            print(f"Creating GitHub repository for {project_name}...")
+            # Wait for the GitHub repo started above
+            repo_url, _ = gh_process.communicate()
+            if gh_process.returncode:
+                raise subprocess.CalledProcessError(gh_process.returncode, gh_process.args)
+            print(f"GitHub repository created: {project_name}")
+            
+            # Connect and push to GitHub
+            remote_url = get_github_remote_url(repo_url.strip().decode('ascii', 'replace'))
+            subprocess.run(["git", "remote", "add", "origin", remote_url], check=True)
+            subprocess.run(["git", "push", "-u", "origin", "main"], check=True)
+            print("Initial commit pushed to GitHub.")
             
-            # Create GitHub repo
-            try:
-                subprocess.run(
-                    ["gh", "repo", "create", project_name, f"--{visibility}", "--source=.", "--remote=origin"],
-                    check=True
-                )
-                print(f"GitHub repository created: {project_name}")
-                
-                # Push to GitHub
-                subprocess.run(["git", "push", "-u", "origin", "main"], check=True)
-                print("Initial commit pushed to GitHub.")
-                
-            except subprocess.CalledProcessError as e:
-                print(f"Error creating GitHub repository: {e}")
-                print("You can manually create and connect to GitHub repository:")
-                print(f"1. Create a new repository named '{project_name}' on GitHub")
-                print("2. Run the following commands to connect to GitHub:")
-                print(f"   git remote add origin https://github.com/{github_username}/{project_name}.git")
-                print("   git branch -M main")
-                print("   git push -u origin main")
-                
-        except subprocess.CalledProcessError:
+        except FileNotFoundError:
             print("GitHub CLI (gh) not found. Please install GitHub CLI to automate repository creation.")
             print("You can install it from: https://cli.github.com/")
             print("\nManual GitHub setup:")
@@ -256,6 +401,14 @@ def setup_git(project_name, use_github=True, visibility="private"):
             print(f"   git remote add origin https://github.com/{github_username}/{project_name}.git")
             print("   git branch -M main")
             print("   git push -u origin main")
+        except subprocess.CalledProcessError as e:
+            print(f"Error creating GitHub repository: {e}")
+            print("You can manually create and connect to GitHub repository:")
+            print(f"1. Create a new repository named '{project_name}' on GitHub")
+            print("2. Run the following commands to connect to GitHub:")
+            print(f"   git remote add origin https://github.com/{github_username}/{project_name}.git")
+            print("   git branch -M main")
+            print("   git push -u origin main")
     else:
         print("\nSkipping GitHub repository creation as requested.")
         print("You can manually create and connect to GitHub repository:")
@@ -274,7 +427,7 @@ def main():
     if len(sys.argv) < 2 or sys.argv[1].startswith('--'):
         current_folder = os.path.basename(os.getcwd())
         # Convert spaces and underscores to hyphens, make lowercase
-        project_name = re.sub(r'[\s_]+', '-', current_folder.lower())
+        project_name = _NAME_RE.sub('-', current_folder.lower())
         
         # If the first argument is a flag, keep it in the sys.argv list
         if len(sys.argv) >= 2 and sys.argv[1].startswith('--'):
@@ -288,13 +441,14 @@ def main():
     # Check for optional flags
     use_github = "--no-github" not in sys.argv
     visibility = "public" if "--public" in sys.argv else "private"
+    upgrade_pip = "--upgrade-pip" in sys.argv
     
     print(f"Setting up Python project: {project_name}")
     
     # Execute setup functions
-    setup_virtual_environment(project_name)
-    create_project_structure(project_name)
-    setup_git(project_name, use_github, visibility)
+    created_files = setup_virtual_environment(project_name, upgrade_pip)
+    created_files += create_project_structure(project_name)
+    setup_git(project_name, use_github, visibility, created_files)
     
     print(f"\nProject setup complete for {project_name}!")
     print("Don't forget to activate your virtual environment:")
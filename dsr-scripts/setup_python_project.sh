@@ -6,7 +6,7 @@
 # making the script executable and activating the virtual environment.
 #
 # Usage:
-#   ./dsr-scripts/setup_python_project.sh [project_name] [--no-github] [--public]
+#   ./dsr-scripts/setup_python_project.sh [project_name] [--no-github] [--public] [--upgrade-pip]
 #
 # Example:
 #   ./dsr-scripts/setup_python_project.sh
@@ -21,6 +21,9 @@
 #   ./dsr-scripts/setup_python_project.sh --public
 #   This will create the project with a public GitHub repository instead of private.
 #
+#   ./dsr-scripts/setup_python_project.sh --upgrade-pip
+#   This will also upgrade pip in the new virtual environment before installing dependencies.
+#
 
 set -e  # Exit immediately if a command exits with a non-zero status
 
@@ -55,6 +58,12 @@ if [[ "$*" == *"--public"* ]]; then
     VISIBILITY_FLAG="--public"
 fi
 
+# Check for pip upgrade flag
+UPGRADE_PIP_FLAG=""
+if [[ "$*" == *"--upgrade-pip"* ]]; then
+    UPGRADE_PIP_FLAG="--upgrade-pip"
+fi
+
 # Check for GitHub CLI if needed
 if [ -z "$GITHUB_FLAG" ]; then
     if ! command -v gh &> /dev/null; then
@@ -123,10 +132,10 @@ cd "$PARENT_DIR"
 
 # Only pass project name if it's a custom name (not derived from directory)
 if [ "$PROJECT_NAME" != "$SANITIZED_FOLDER" ]; then
-    "$PYTHON_SCRIPT" "$PROJECT_NAME" $GITHUB_FLAG $VISIBILITY_FLAG
+    "$PYTHON_SCRIPT" "$PROJECT_NAME" $GITHUB_FLAG $VISIBILITY_FLAG $UPGRADE_PIP_FLAG
 else
     # Use default (parent directory name)
-    "$PYTHON_SCRIPT" $GITHUB_FLAG $VISIBILITY_FLAG
+    "$PYTHON_SCRIPT" $GITHUB_FLAG $VISIBILITY_FLAG $UPGRADE_PIP_FLAG
 fi
 
 # Add .gitignore to exclude dsr-scripts directory